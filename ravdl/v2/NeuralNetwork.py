@@ -1,6 +1,7 @@
 import ravop as R
 import onnx
 from terminaltables import AsciiTable
+from .layers import Conv2D, BatchNormalization, Activation, FusedConvBNAct
 from .utils.data_manipulation import batch_iterator
 
 loss_op_mapping = {
@@ -38,6 +39,7 @@ class NeuralNetwork():
         self.input = None
         self.output = None
         self.layer_type=[]
+        self.fused = False
 
         self.val_set = None
         if validation_data:
@@ -69,6 +71,15 @@ class NeuralNetwork():
             layer_name += "_"+layer.activation_name
         layer.set_layer_name(layer_name)
 
+        # Freeze the layer's static op arguments now that it is fully wired
+        layer.compile()
+
+        # Align the previous layer's He init gain with this activation
+        if isinstance(layer, Activation) and self.layers:
+            prev_layer = self.layers[-1]
+            if hasattr(prev_layer, '_set_init_gain'):
+                prev_layer._set_init_gain(layer.activation_name)
+
         # Add layer to the network
         self.layers.append(layer)
 
@@ -94,8 +105,30 @@ class NeuralNetwork():
 
         return loss #, acc
 
+    def _fuse_layers(self):
+        """ Rewrite Conv2D -> BatchNormalization -> Activation chains into a
+        single FusedConvBNAct layer. Run once before training so each fused
+        block emits one op per pass instead of three. """
+        if self.fused:
+            return
+        fused_layers = []
+        i = 0
+        while i < len(self.layers):
+            layer = self.layers[i]
+            if isinstance(layer, Conv2D) and i + 2 < len(self.layers) \
+                    and isinstance(self.layers[i+1], BatchNormalization) \
+                    and isinstance(self.layers[i+2], Activation):
+                fused_layers.append(FusedConvBNAct.from_layers(layer, self.layers[i+1], self.layers[i+2]))
+                i += 3
+            else:
+                fused_layers.append(layer)
+                i += 1
+        self.layers = fused_layers
+        self.fused = True
+
     def fit(self, X, y, n_epochs, batch_size, save_model = False, persist_weights=False):
         """ Trains the model for a fixed number of epochs """
+        self._fuse_layers()
         for epoch in range(1, n_epochs + 1):
             print('\nEpoch: ', epoch)
             batch_error = []
@@ -3,12 +3,60 @@ import numpy as np
 import math
 from .utils.data_operations import determine_padding
 
+# Flag tokens sent to the backend. Built once so the hot per-batch path
+# reuses the same string objects instead of rebuilding them every step.
+bool_flags = {True: "True", False: "False"}
+
+# Shared generator for weight init; draws straight into float32 buffers
+rng = np.random.default_rng()
+
+# He (Kaiming) init gains per activation: std = gain / sqrt(fan_in).
+# Layers default to the linear gain and are re-aligned when the following
+# Activation layer is added to the network.
+init_gains = {
+    'relu': math.sqrt(2.0),
+    'tanh': 5.0 / 3,
+    'sigmoid': 1.0,
+    'softmax': 1.0,
+}
+
+def pad_to_multiple(n, multiple=8):
+    """ Round n up to the nearest multiple. Used to tell the backend what
+    size to pad its GEMM tiles to (tensor cores / vector widths want
+    multiples of 8) without changing the layer's logical shape. """
+    return ((n + multiple - 1) // multiple) * multiple
+
+class ConvScratchPool(object):
+    """ Tracks the largest im2col/col2im footprint requested by any conv
+    layer so the backend can keep one shared scratch buffer, sized for the
+    biggest layer, instead of allocating one per layer. Layers register
+    their footprint at compile time; the pooled max is sent with every conv
+    op (all layers have registered by the first emitted op) so the backend
+    can pre-size the buffer once. """
+
+    def __init__(self, key="conv2d_scratch"):
+        self.key = key
+        self.size = 0
+
+    def register(self, size):
+        if size > self.size:
+            self.size = size
+        return self.key
+
+conv_scratch = ConvScratchPool()
+
 class Layer(object):
 
+    # Lazily filled caches for parameters()/output_shape(). Both are fixed
+    # once the layer is wired into a network, so compute them at most once.
+    _params_cache = None
+    _output_shape_cache = None
+
     def set_input_shape(self, shape):
         """ Sets the shape that the layer expects of the input in the forward
         pass method """
         self.input_shape = shape
+        self._output_shape_cache = None
 
     def set_layer_name(self, name=None):
         """ Sets the name of the layer. """
@@ -25,40 +73,90 @@ class Layer(object):
         """ The number of trainable parameters used by the layer """
         return 0
 
+    def compile(self, shape=None):
+        """ One-time setup run after the layer is wired into a network.
+        Records the input shape and freezes the static op arguments so the
+        per-batch passes reuse one prebuilt kwargs dict per op instead of
+        rebuilding it every step. """
+        if shape is not None:
+            self.set_input_shape(shape)
+        self._build_op_args()
+
+    def _build_op_args(self):
+        """ Freeze the op arguments that never change between steps.
+        Overridden by layers that carry static configuration. """
+        self._fp_args = {}
+        self._bp_args = {}
+
     def output_shape(self):
         """ The shape of the output produced by forward_pass """
         raise NotImplementedError()
 
 
 class Dense(Layer):
-    def __init__(self, n_units, input_shape=None):
+    def __init__(self, n_units, input_shape=None, dtype=np.float32):
         self.forward_pass = None
         self.backward_pass = None
         self.n_units = n_units
+        self.aligned_units = pad_to_multiple(n_units)
+        # Weight/compute precision. Half-precision dtypes additionally set
+        # cast_mode="amp" on the forward op for mixed-precision execution.
+        self.dtype = np.dtype(dtype)
+        self._cast_mode = "amp" if self.dtype.itemsize < 4 else "full"
         self.layer_input = None
         self.input_shape = input_shape
         self.trainable = True
 
     def initialize(self, optimizer):
         self.optimizer = optimizer
-        np_limit = 1 / math.sqrt(self.input_shape[0])
-        self.np_W  = np.random.uniform(-np_limit, np_limit, (self.input_shape[0], self.n_units))
-        self.np_w0 = np.zeros((1, self.n_units))
+        # Serialized once and reused on every backward call; the handle
+        # lets the backend cache the parsed config across steps
+        self._opt_payload = optimizer.data_dict()
+        self._opt_handle = optimizer.handle
+        # He init, single float32 draw scaled in place. The gain starts at
+        # the linear value and is re-aligned if an Activation follows.
+        self._fan_in = self.input_shape[0]
+        self.init_gain = 1.0
+        self._init_payload = str({'name': 'he_normal', 'gain': self.init_gain})
+        # the Generator only fills float32/float64 buffers, so half
+        # precision draws in float32 and casts down once
+        self.np_W  = np.empty((self._fan_in, self.n_units), dtype=np.float32)
+        rng.standard_normal(out=self.np_W, dtype=np.float32)
+        self.np_W *= self.init_gain / math.sqrt(self._fan_in)
+        if self.dtype != np.float32:
+            self.np_W = self.np_W.astype(self.dtype)
+        self.np_w0 = np.zeros((1, self.n_units), dtype=self.dtype)
+
+    def _set_init_gain(self, activation_name):
+        """ Align the He init gain with the activation that follows. """
+        gain = init_gains.get(activation_name, 1.0)
+        if gain == self.init_gain:
+            return
+        self.np_W *= gain / self.init_gain
+        self.init_gain = gain
+        self._init_payload = str({'name': 'he_normal', 'gain': gain})
+        self._fp_args['init_data'] = self._init_payload
+
+    def parameters(self):
+        if self._params_cache is None:
+            self._params_cache = self.np_W.size + self.np_w0.size
+        return self._params_cache
 
-    def parameters(self): 
-        return np.prod(self.np_W.shape) + np.prod(self.np_w0.shape)
+    def _build_op_args(self):
+        self._fp_args = dict(n_units=self.n_units, aligned_units=self.aligned_units, input_shape=self.input_shape, init_data=self._init_payload, dtype=self.dtype.name, cast_mode=self._cast_mode)
+        self._bp_args = dict(optimizer=self._opt_payload, opt_handle=self._opt_handle)
 
     def _forward_pass(self, X, input_layer = "False", training=True):
         self.layer_input = X
         self.forward_pass = R.forward_pass_dense(
-            X, n_units=self.n_units, input_shape = self.input_shape, data = self.backward_pass, input_layer = input_layer
+            X, data = self.backward_pass, input_layer = input_layer, **self._fp_args
         )
         return self.forward_pass
 
     def _backward_pass(self, loss_grad, input_layer = "False"):
         if self.trainable:
             self.backward_pass = R.backward_pass_dense(
-                loss_grad, layer_input = self.layer_input, optimizer = self.optimizer.data_dict(), data = self.forward_pass, input_layer = input_layer
+                loss_grad, layer_input = self.layer_input, data = self.forward_pass, input_layer = input_layer, **self._bp_args
             )
         return self.backward_pass
 
@@ -72,12 +170,16 @@ class Dense(Layer):
 class BatchNormalization(Layer):
     """Batch normalization.
     """
-    def __init__(self, momentum=0.99, epsilon=1e-2):
+    def __init__(self, momentum=0.99, epsilon=1e-2, stats="welford"):
         self.momentum = momentum
         self.float_momentum = momentum
         self.trainable = True
         self.eps = epsilon
         self.float_eps = epsilon
+        # How the backend computes batch statistics. "welford" accumulates
+        # mean and variance in a single pass over the batch; "two_pass"
+        # keeps the classic mean-then-variance reduction.
+        self.stats = stats
         self.running_mean = None
         self.running_var = None
         self.forward_pass = None
@@ -86,54 +188,52 @@ class BatchNormalization(Layer):
     def initialize(self, optimizer):
         # Initialize the parameters
         self.optimizer = optimizer
+        # Serialized once and reused on every backward call; the handle
+        # lets the backend cache the parsed config across steps
+        self._opt_payload = optimizer.data_dict()
+        self._opt_handle = optimizer.handle
 
         if len(self.input_shape) == 1:
             shape = (1, self.input_shape[0])
         else:
-            shape = (1,self.input_shape[0], 1,1)
+            # NHWC feature maps: channels are the last axis
+            shape = (1, 1, 1, self.input_shape[-1])
         # np equivalent for summary params
         self.np_gamma = np.ones(shape)
         self.np_beta = np.zeros(shape)
 
     def parameters(self):
-        return np.prod(self.np_gamma.shape) + np.prod(self.np_beta.shape)        
+        if self._params_cache is None:
+            self._params_cache = self.np_gamma.size + self.np_beta.size
+        return self._params_cache
 
-    def _forward_pass(self, X, input_layer="False", training=True):
-
-        if training:
-            training="True"
-        else:
-            training = "False"
-
-        if self.trainable:
-            trainable="True"
-        else:
-            trainable="False"
+    def _build_op_args(self):
+        self._fp_args = dict(input_shape=self.input_shape, momentum=self.momentum, eps=self.eps, stats=self.stats)
+        self._bp_args = dict(input_shape=self.input_shape, opt_handle=self._opt_handle)
 
+    def _forward_pass(self, X, input_layer="False", training=True):
 
         self.forward_pass = R.forward_pass_batchnorm(
-            X, input_shape=self.input_shape,
-            momentum = self.momentum, eps = self.eps,
-            training=training, trainable=trainable, 
+            X,
+            training=bool_flags[training], trainable=bool_flags[self.trainable],
             data = self.backward_pass,
-            input_layer=input_layer
+            input_layer=input_layer, **self._fp_args
         )
 
         return self.forward_pass
 
     def _backward_pass(self, accum_grad, input_layer="False"):
 
-        # Save parameters used during the forward pass
-        if self.trainable:
-            trainable = "True"
+        # The optimizer config is only consulted when the parameters update,
+        # so a frozen layer sends nothing instead of the serialized dict
+        optimizer = self._opt_payload if self.trainable else ""
 
         self.backward_pass = R.backward_pass_batchnorm(
             accum_grad,
-            input_shape = self.input_shape,
-            optimizer = self.optimizer.data_dict(),
-            trainable=trainable,
+            optimizer = optimizer,
+            trainable=bool_flags[self.trainable],
             data = self.forward_pass,
-            input_layer = input_layer
+            input_layer = input_layer, **self._bp_args
         )
 
         return self.backward_pass
@@ -154,9 +254,14 @@ class Dropout(Layer):
     p: float
         The probability that unit x is set to zero.
     """
-    def __init__(self, p=0.2):
+    def __init__(self, p=0.2, mask_format="bitpacked"):
         self.p = p
+        # "bitpacked" has the backend draw the keep-mask as packed bits
+        # (1 bit per unit, 32 units per RNG word) instead of a full float
+        # tensor; "dense" keeps the old float mask.
+        self.mask_format = mask_format
         self._mask = None
+        self._passed_through = False
         self.input_shape = None
         self.n_units = None
         self.pass_through = True
@@ -164,17 +269,26 @@ class Dropout(Layer):
         self.forward_pass = None
         self.backward_pass = None
 
+    def _build_op_args(self):
+        self._fp_args = dict(p=self.p, mask_format=self.mask_format)
+        self._bp_args = {}
+
     def _forward_pass(self, X, training=True, input_layer="False"):
         # c = g.one - self.p
-        if training:
-            training = "True"
-        else:
-            training = "False"
-
-        self.forward_pass = R.forward_pass_dropout(X, p = self.p, training=training, input_layer = input_layer)
+        # Dropout is the identity at p == 0 or in inference, so skip the
+        # graph op entirely instead of shipping a no-op to a worker. The
+        # network's input layer still emits so the backend sees the input.
+        if (self.p == 0 or not training) and input_layer == "False":
+            self._passed_through = True
+            return X
+        self._passed_through = False
+        self.forward_pass = R.forward_pass_dropout(X, training=bool_flags[training], input_layer = input_layer, **self._fp_args)
         return self.forward_pass
 
     def _backward_pass(self, accum_grad, input_layer="False"):
+        if self._passed_through:
+            self.backward_pass = accum_grad
+            return self.backward_pass
         self.backward_pass = R.backward_pass_dropout(accum_grad, data = self.forward_pass, input_layer = input_layer)
         return self.backward_pass
 
@@ -199,21 +313,22 @@ class Activation(Layer):
 
     def __init__(self, name):
         self.activation_name = name
+        self._act_payload = str({'name': name})
         self.trainable = True
         self.forward_pass = None
         self.backward_pass = None
-        
+
 
     # def layer_name(self):
     #     return "Activation (%s)" % (self.activation_func.__class__.__name__)
 
     def _forward_pass(self, X, training=True, input_layer = "False"):
         self.layer_input = X
-        self.forward_pass = R.forward_pass_activation(X, act_data = str({'name':self.activation_name}), input_layer = input_layer)
+        self.forward_pass = R.forward_pass_activation(X, act_data = self._act_payload, input_layer = input_layer)
         return self.forward_pass
 
     def _backward_pass(self, accum_grad, input_layer="False"):
-        self.backward_pass = R.backward_pass_activation(accum_grad, layer_input = self.layer_input, act_data = str({'name':self.activation_name}), input_layer = input_layer)
+        self.backward_pass = R.backward_pass_activation(accum_grad, layer_input = self.layer_input, act_data = self._act_payload, input_layer = input_layer)
         return self.backward_pass
 
     def output_shape(self):
@@ -224,11 +339,30 @@ class Activation(Layer):
 
 class Conv2D(Layer):
 
-    def __init__(self, n_filters, filter_shape, input_shape=None, padding='same', stride=1):
+    def __init__(self, n_filters, filter_shape, input_shape=None, padding='same', stride=1, algo='implicit_gemm', im2col_block=2, dtype=np.float32):
         self.n_filters = n_filters
         self.filter_shape = filter_shape
+        # Weight/compute precision. Half-precision dtypes additionally set
+        # cast_mode="amp" on the forward op for mixed-precision execution.
+        self.dtype = np.dtype(dtype)
+        self._cast_mode = "amp" if self.dtype.itemsize < 4 else "full"
         self.padding = padding
+        self._padding_payload = str({'padding': padding})
+        # Padding amounts depend only on filter_shape and padding mode,
+        # so resolve them once here rather than on every output_shape call
+        self._pad_h, self._pad_w = determine_padding(filter_shape, output_shape=padding)
         self.stride = stride
+        self.aligned_filters = pad_to_multiple(n_filters)
+        # Convolution algorithm the backend should use. "implicit_gemm"
+        # gathers input patches inside the GEMM mainloop and never
+        # materializes the im2col matrix; "im2col" keeps the explicit
+        # lowering and honors im2col_block below.
+        self.algo = algo
+        # Number of output columns the backend expands per im2col step.
+        # Keeps the scratch buffer O(block) instead of O(out_h * out_w).
+        self.im2col_block = im2col_block
+        # A 1x1 stride-1 conv is a plain reshape-and-GEMM; no im2col needed
+        self._pointwise = tuple(filter_shape) == (1, 1) and stride == 1
         self.input_shape = input_shape
         self.trainable = True
         self.W = None
@@ -238,55 +372,247 @@ class Conv2D(Layer):
 
     def initialize(self, optimizer):
         self.optimizer = optimizer
+        # Serialized once and reused on every backward call; the handle
+        # lets the backend cache the parsed config across steps
+        self._opt_payload = optimizer.data_dict()
+        self._opt_handle = optimizer.handle
 
-        # Initialize the weights
+        # Initialize the weights. NHWC layout: channels are innermost so
+        # im2col on the backend reads/writes contiguous channel runs.
         filter_height, filter_width = self.filter_shape
-        channels = self.input_shape[0]
-
-        # equivalent for summary params
-        np_limit = 1 / math.sqrt(np.prod(self.filter_shape))
-        self.np_W  = np.random.uniform(-np_limit, np_limit, size=(self.n_filters, channels, filter_height, filter_width))
-        self.np_w0 = np.zeros((self.n_filters, 1))
+        channels = self.input_shape[-1]
+
+        # equivalent for summary params; He init with one float32 draw
+        # straight into the weight buffer, scaled in place. The gain starts
+        # at the linear value and is re-aligned if an Activation follows.
+        self._fan_in = filter_height * filter_width * channels
+        self.init_gain = 1.0
+        self._init_payload = str({'name': 'he_normal', 'gain': self.init_gain})
+        self.np_W  = np.empty((filter_height, filter_width, channels, self.n_filters), dtype=np.float32)
+        rng.standard_normal(out=self.np_W, dtype=np.float32)
+        self.np_W *= self.init_gain / math.sqrt(self._fan_in)
+        if self.dtype != np.float32:
+            self.np_W = self.np_W.astype(self.dtype)
+        self.np_w0 = np.zeros((self.n_filters, 1), dtype=self.dtype)
+
+    def _set_init_gain(self, activation_name):
+        """ Align the He init gain with the activation that follows. """
+        gain = init_gains.get(activation_name, 1.0)
+        if gain == self.init_gain:
+            return
+        self.np_W *= gain / self.init_gain
+        self.init_gain = gain
+        self._init_payload = str({'name': 'he_normal', 'gain': gain})
+        self._fp_args['init_data'] = self._init_payload
 
     def parameters(self):
-        return np.prod(self.np_W.shape) + np.prod(self.np_w0.shape)
+        if self._params_cache is None:
+            self._params_cache = self.np_W.size + self.np_w0.size
+        return self._params_cache
+
+    def _build_op_args(self):
+        if self._pointwise:
+            self._fp_args = dict(
+                input_shape=self.input_shape,
+                n_filters=self.n_filters, aligned_filters=self.aligned_filters,
+                layout="NHWC", init_data=self._init_payload,
+                dtype=self.dtype.name, cast_mode=self._cast_mode
+            )
+            self._bp_args = dict(
+                n_filters=self.n_filters, aligned_filters=self.aligned_filters,
+                layout="NHWC",
+                optimizer=self._opt_payload, opt_handle=self._opt_handle
+            )
+        else:
+            # im2col/col2im footprint of this layer; all conv layers share
+            # one backend scratch buffer sized for the largest of them
+            out_height, out_width, _ = self.output_shape()
+            scratch_size = self.input_shape[-1] * math.prod(self.filter_shape) * out_height * out_width
+            conv_args = dict(
+                n_filters=self.n_filters, aligned_filters=self.aligned_filters,
+                filter_shape=self.filter_shape, stride=self.stride, padding_data=self._padding_payload,
+                pad_h=self._pad_h, pad_w=self._pad_w,
+                layout="NHWC", algo=self.algo, im2col_block=self.im2col_block,
+                scratch_key=conv_scratch.register(scratch_size), scratch_size=scratch_size
+            )
+            self._fp_args = dict(conv_args, input_shape=self.input_shape, init_data=self._init_payload, dtype=self.dtype.name, cast_mode=self._cast_mode)
+            self._bp_args = dict(conv_args, optimizer=self._opt_payload, opt_handle=self._opt_handle)
 
     def _forward_pass(self, X, input_layer="False", training=True):
         self.layer_input = X
-        self.forward_pass = R.forward_pass_conv2d(
-            X,
-            input_shape = self.input_shape, 
-            n_filters = self.n_filters, filter_shape = self.filter_shape, stride = self.stride, padding_data=str({'padding':self.padding}),
-            data = self.backward_pass, 
-            input_layer = input_layer
-        )
-        return self.forward_pass 
+        if self._pointwise:
+            self.forward_pass = R.forward_pass_conv2d_pointwise(
+                X,
+                data = self.backward_pass,
+                input_layer = input_layer, **self._fp_args
+            )
+        else:
+            self.forward_pass = R.forward_pass_conv2d(
+                X,
+                scratch_pool_size = conv_scratch.size,
+                data = self.backward_pass,
+                input_layer = input_layer, **self._fp_args
+            )
+        return self.forward_pass
 
 
     def _backward_pass(self, accum_grad, input_layer = "False"):
-        # Reshape accumulated gradient into column shape
-        if self.trainable:
-            trainable = "True"
-        else:
-            trainable = "False"
+        if self._pointwise:
+            self.backward_pass = R.backward_pass_conv2d_pointwise(accum_grad,
+                layer_input = self.layer_input,
+                data = self.forward_pass,
+                trainable = bool_flags[self.trainable],
+                input_layer=input_layer, **self._bp_args
+            )
+            return self.backward_pass
 
+        # Reshape accumulated gradient into column shape
         self.backward_pass = R.backward_pass_conv2d(accum_grad,
             layer_input = self.layer_input,
-            n_filters = self.n_filters, filter_shape = self.filter_shape, stride = self.stride, padding_data=str({'padding':self.padding}),
-            optimizer = self.optimizer.data_dict(),
+            scratch_pool_size = conv_scratch.size,
             data = self.forward_pass,
-            trainable = trainable,
-            input_layer=input_layer
+            trainable = bool_flags[self.trainable],
+            input_layer=input_layer, **self._bp_args
+        )
+
+        return self.backward_pass
+
+    def output_shape(self):
+        if self._output_shape_cache is None:
+            height, width, channels = self.input_shape
+            output_height = (height + sum(self._pad_h) - self.filter_shape[0]) // self.stride + 1
+            output_width = (width + sum(self._pad_w) - self.filter_shape[1]) // self.stride + 1
+            self._output_shape_cache = (output_height, output_width, self.n_filters)
+        return self._output_shape_cache
+
+    def persist_weights(self):
+        self.forward_pass.persist_op("{}_forward_pass".format(self.layer_name))
+        self.backward_pass.persist_op("{}_backward_pass".format(self.layer_name))
+
+class FusedConvBNAct(Layer):
+    """Fused Conv2D -> BatchNormalization -> Activation block.
+
+    Emits a single forward/backward op for the whole chain instead of three,
+    so the intermediate feature maps never round-trip through backend memory.
+    Built from already-added layers by NeuralNetwork's fusion rewrite.
+    """
+
+    def __init__(self, n_filters, filter_shape, input_shape=None, padding='same', stride=1, algo='implicit_gemm', im2col_block=2, momentum=0.99, epsilon=1e-2, stats='welford', activation='relu', dtype=np.float32):
+        self.n_filters = n_filters
+        self.filter_shape = filter_shape
+        # Weight/compute precision, as on Conv2D
+        self.dtype = np.dtype(dtype)
+        self._cast_mode = "amp" if self.dtype.itemsize < 4 else "full"
+        self.padding = padding
+        self._padding_payload = str({'padding': padding})
+        self._pad_h, self._pad_w = determine_padding(filter_shape, output_shape=padding)
+        self.stride = stride
+        self.aligned_filters = pad_to_multiple(n_filters)
+        # Convolution algorithm and im2col blocking, as on Conv2D
+        self.algo = algo
+        self.im2col_block = im2col_block
+        self.input_shape = input_shape
+        self.momentum = momentum
+        self.eps = epsilon
+        # Batch-statistics algorithm, as on BatchNormalization
+        self.stats = stats
+        self.activation_name = activation
+        self._act_payload = str({'name': activation})
+        self.trainable = True
+        self.forward_pass = None
+        self.backward_pass = None
+
+    @classmethod
+    def from_layers(cls, conv, bn, act):
+        """ Build a fused layer carrying the configuration of an existing
+        Conv2D, BatchNormalization and Activation triple. """
+        fused = cls(
+            conv.n_filters, conv.filter_shape, input_shape=conv.input_shape,
+            padding=conv.padding, stride=conv.stride, algo=conv.algo, im2col_block=conv.im2col_block,
+            momentum=bn.float_momentum, epsilon=bn.float_eps, stats=bn.stats,
+            activation=act.activation_name, dtype=conv.dtype
+        )
+        # Carry over the frozen/trainable state so fusing a frozen triple
+        # does not silently un-freeze its weights
+        fused.trainable = conv.trainable
+        fused.initialize(conv.optimizer)
+        fused.set_layer_name(conv.get_layer_name() + "_fused")
+        fused.compile()
+        return fused
+
+    def initialize(self, optimizer):
+        self.optimizer = optimizer
+        # Serialized once and reused on every backward call; the handle
+        # lets the backend cache the parsed config across steps
+        self._opt_payload = optimizer.data_dict()
+        self._opt_handle = optimizer.handle
+
+        filter_height, filter_width = self.filter_shape
+        channels = self.input_shape[-1]
+
+        # np equivalents for summary params (NHWC weight layout); He init
+        # with a single float32 draw, scaled in place. The fused block knows
+        # its activation up front, so the gain is aligned immediately.
+        self._fan_in = filter_height * filter_width * channels
+        self.init_gain = init_gains.get(self.activation_name, 1.0)
+        self._init_payload = str({'name': 'he_normal', 'gain': self.init_gain})
+        self.np_W  = np.empty((filter_height, filter_width, channels, self.n_filters), dtype=np.float32)
+        rng.standard_normal(out=self.np_W, dtype=np.float32)
+        self.np_W *= self.init_gain / math.sqrt(self._fan_in)
+        if self.dtype != np.float32:
+            self.np_W = self.np_W.astype(self.dtype)
+        self.np_w0 = np.zeros((self.n_filters, 1), dtype=self.dtype)
+        self.np_gamma = np.ones((1, 1, 1, self.n_filters))
+        self.np_beta = np.zeros((1, 1, 1, self.n_filters))
+
+    def parameters(self):
+        if self._params_cache is None:
+            self._params_cache = self.np_W.size + self.np_w0.size + self.np_gamma.size + self.np_beta.size
+        return self._params_cache
+
+    def _build_op_args(self):
+        out_height, out_width, _ = self.output_shape()
+        scratch_size = self.input_shape[-1] * math.prod(self.filter_shape) * out_height * out_width
+        block_args = dict(
+            n_filters=self.n_filters, aligned_filters=self.aligned_filters,
+            filter_shape=self.filter_shape, stride=self.stride, padding_data=self._padding_payload,
+            pad_h=self._pad_h, pad_w=self._pad_w,
+            layout="NHWC", algo=self.algo, im2col_block=self.im2col_block,
+            momentum=self.momentum, eps=self.eps, stats=self.stats,
+            act_data=self._act_payload,
+            scratch_key=conv_scratch.register(scratch_size), scratch_size=scratch_size
+        )
+        self._fp_args = dict(block_args, input_shape=self.input_shape, init_data=self._init_payload, dtype=self.dtype.name, cast_mode=self._cast_mode)
+        self._bp_args = dict(block_args, optimizer=self._opt_payload, opt_handle=self._opt_handle)
+
+    def _forward_pass(self, X, input_layer="False", training=True):
+        self.layer_input = X
+        self.forward_pass = R.forward_pass_conv2d_bn_act(
+            X,
+            scratch_pool_size = conv_scratch.size,
+            training = bool_flags[training],
+            data = self.backward_pass,
+            input_layer = input_layer, **self._fp_args
         )
+        return self.forward_pass
 
+    def _backward_pass(self, accum_grad, input_layer = "False"):
+        self.backward_pass = R.backward_pass_conv2d_bn_act(accum_grad,
+            layer_input = self.layer_input,
+            scratch_pool_size = conv_scratch.size,
+            data = self.forward_pass,
+            trainable = bool_flags[self.trainable],
+            input_layer=input_layer, **self._bp_args
+        )
         return self.backward_pass
 
     def output_shape(self):
-        channels, height, width = self.input_shape
-        pad_h, pad_w = determine_padding(self.filter_shape, output_shape=self.padding)
-        output_height = (height + np.sum(pad_h) - self.filter_shape[0]) / self.stride + 1
-        output_width = (width + np.sum(pad_w) - self.filter_shape[1]) / self.stride + 1
-        return self.n_filters, int(output_height), int(output_width)
+        if self._output_shape_cache is None:
+            height, width, channels = self.input_shape
+            output_height = (height + sum(self._pad_h) - self.filter_shape[0]) // self.stride + 1
+            output_width = (width + sum(self._pad_w) - self.filter_shape[1]) // self.stride + 1
+            self._output_shape_cache = (output_height, output_width, self.n_filters)
+        return self._output_shape_cache
 
     def persist_weights(self):
         self.forward_pass.persist_op("{}_forward_pass".format(self.layer_name))
@@ -311,7 +637,9 @@ class Flatten(Layer):
         return self.backward_pass
 
     def output_shape(self):
-        return (int(np.prod(self.input_shape)),)
+        if self._output_shape_cache is None:
+            self._output_shape_cache = (math.prod(self.input_shape),)
+        return self._output_shape_cache
 
     def persist_weights(self):
         pass
@@ -323,17 +651,28 @@ class MaxPooling2D(Layer):
         self.pool_shape = pool_shape
         self.stride = stride
         self.padding_data = {'padding': padding}
+        self._padding_payload = str(self.padding_data)
+        # 2x2 stride-2 windows never overlap, so the backend can take the
+        # max of register pairs branchlessly (SWAR/SIMD) instead of walking
+        # windows through the generic gather kernel
+        self._kernel = "swar2x2" if tuple(pool_shape) == (2, 2) and stride == 2 else "generic"
         self.trainable = True
         self.forward_pass = None
         self.backward_pass = None
 
+    def _build_op_args(self):
+        self._fp_args = dict(
+            input_shape=self.input_shape,
+            pool_shape=self.pool_shape, stride=self.stride, padding_data=self._padding_payload,
+            kernel=self._kernel
+        )
+        self._bp_args = dict(self._fp_args)
+
     def _forward_pass(self, X, training=True, input_layer = "False"):
 
         self.forward_pass = R.forward_pass_maxpool2d(
             X,
-            input_shape = self.input_shape, 
-            pool_shape = self.pool_shape, stride = self.stride, padding_data = str(self.padding_data),
-            input_layer = input_layer
+            input_layer = input_layer, **self._fp_args
         )
 
         return self.forward_pass
@@ -342,23 +681,22 @@ class MaxPooling2D(Layer):
         # batch_size, _, _, _ = accum_grad().shape
 
         self.backward_pass = R.backward_pass_maxpool2d(
-            accum_grad, 
-            input_shape = self.input_shape, 
-            pool_shape = self.pool_shape, stride = self.stride, 
-            padding_data = str(self.padding_data),
+            accum_grad,
             data = self.forward_pass,
-            input_layer = input_layer
+            input_layer = input_layer, **self._bp_args
         )
 
         return self.backward_pass
 
     def output_shape(self):
-        channels, height, width = self.input_shape
-        out_height = (height - self.pool_shape[0]) / self.stride + 1
-        out_width = (width - self.pool_shape[1]) / self.stride + 1
-        assert out_height % 1 == 0
-        assert out_width % 1 == 0
-        return channels, int(out_height), int(out_width)
+        if self._output_shape_cache is None:
+            height, width, channels = self.input_shape
+            out_height = (height - self.pool_shape[0]) / self.stride + 1
+            out_width = (width - self.pool_shape[1]) / self.stride + 1
+            assert out_height % 1 == 0
+            assert out_width % 1 == 0
+            self._output_shape_cache = (int(out_height), int(out_width), channels)
+        return self._output_shape_cache
 
     def persist_weights(self):
         pass
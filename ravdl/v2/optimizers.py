@@ -1,22 +1,34 @@
 import ravop as R
 
 class RMSprop():
+    _instances = 0
+
     def __init__(self, learning_rate=0.01, rho=0.9):
         self.learning_rate = learning_rate
         self.Eg = None # Running average of the square gradients at w
         self.eps = 1e-8
         self.rho = rho
+        # Stable handle so the backend can parse the config once and look it
+        # up on every subsequent step instead of re-deserializing
+        RMSprop._instances += 1
+        self.handle = "rmsprop_{}".format(RMSprop._instances)
+        self._data_dict = None
 
     def data_dict(self):
-        return str({
-            "name": "RMSprop",
-            "learning_rate" : self.learning_rate,
-            # "Eg": self.Eg,
-            # "eps": self.eps,
-            "rho": self.rho
-        })
+        if self._data_dict is None:
+            self._data_dict = str({
+                "name": "RMSprop",
+                "handle": self.handle,
+                "learning_rate" : self.learning_rate,
+                # "Eg": self.Eg,
+                # "eps": self.eps,
+                "rho": self.rho
+            })
+        return self._data_dict
 
 class Adam():
+    _instances = 0
+
     def __init__(self, learning_rate=0.001, b1=0.9, b2=0.999):
         self.learning_rate = learning_rate
         self.eps = 1e-8
@@ -25,12 +37,19 @@ class Adam():
         # Decay rates
         self.b1 = b1
         self.b2 = b2
+        # Stable handle so the backend can parse the config once and look it
+        # up on every subsequent step instead of re-deserializing
+        Adam._instances += 1
+        self.handle = "adam_{}".format(Adam._instances)
+        self._data_dict = None
 
     def data_dict(self):
-        return str({
-            "name": "Adam",
-            "learning_rate" : self.learning_rate,
-            "b1":self.b1,
-            "b2": self.b2
-        })
-
+        if self._data_dict is None:
+            self._data_dict = str({
+                "name": "Adam",
+                "handle": self.handle,
+                "learning_rate" : self.learning_rate,
+                "b1":self.b1,
+                "b2": self.b2
+            })
+        return self._data_dict